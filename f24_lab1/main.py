@@ -1,33 +1,90 @@
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 from autogen import ConversableAgent
+import numpy as np
+import bisect
+import functools
+import itertools
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 import sys
+import threading
 import os
 import math
 import re
 
+INV_SQRT125 = 1 / math.sqrt(125)
+# sqrt of every valid customer service score (0-5), so the reduction is a table lookup and a dot product
+_SQRT_CS = np.sqrt(np.arange(6, dtype=np.float64))
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+if njit is not None:
+    # Eager signature so the kernel is compiled once up front instead of on first dispatch.
+    @njit("float64(int8[::1], int8[::1])", cache=True, fastmath=True)
+    def _score_kernel(food, customer_service):
+        total = 0.0
+        for i in range(food.shape[0]):
+            total += food[i] * math.sqrt(customer_service[i])
+        return total
+else:
+    def _score_kernel(food, customer_service):
+        return float(np.dot(food, _SQRT_CS[customer_service]))
+
+
+@functools.lru_cache(maxsize=1)
+def _build_index(path: str, mtime_ns: int, file_size: int) -> Dict[str, Dict[str, List[str]]]:
+    # Read the reviews file once per (path, mtime_ns, file_size) and group every "<restaurant>. <review>" line,
+    # split on the first ". ", as {casefolded name: {restaurant name: [reviews]}}.
+    # One bulk read, with lines split by bytes.find (memchr) rather than the decoding text line iterator
+    with open(path, "rb") as file:
+        data = file.read()
+    
+    index = defaultdict(lambda: defaultdict(list))
+    find = data.find
+    start = 0
+    size = len(data)
+    while start < size:
+        end = find(b'\n', start)
+        if end == -1:
+            end = size
+        sep = find(b'. ', start, end)
+        if sep != -1:
+            current_restaurant = data[start:sep].strip().decode('utf-8')
+            review = data[sep + 2:end].rstrip().decode('utf-8')
+            index[current_restaurant.casefold()][current_restaurant].append(review)
+        start = end + 1
+    return {name: dict(restaurants) for name, restaurants in index.items()}
+
+
+@functools.lru_cache(maxsize=256)
+def _fetch_cached(needle: str, path: str, mtime_ns: int, file_size: int) -> Dict[str, List[str]]:
+    # Reviews for a normalized restaurant name. Keyed on the file's absolute path, nanosecond mtime and size, so
+    # another cwd's file or an edit within the mtime granularity doesn't hit a stale entry.
+    restaurant_reviews = {}
+    
+    # Case-insensitive matching of restaurant names, once per distinct name rather than per line
+    for name, restaurants in _build_index(path, mtime_ns, file_size).items():
+        if needle in name:
+            restaurant_reviews.update(restaurants)
+    return restaurant_reviews
+
+
 def fetch_restaurant_data(restaurant_name: str) -> Dict[str, List[str]]:
     # This function takes in a restaurant name and returns the reviews for that restaurant.
     # The output should be a dictionary with the key being the restaurant name and the value being a list of reviews for that restaurant.
-    restaurant_reviews = {}
-    
     try:
-        with open("restaurant-data.txt", "r") as file:
-            for line in file:
-                # Extract the restaurant name from the beginning of the line
-                parts = line.strip().split('. ', 1)
-                if len(parts) >= 2:
-                    current_restaurant = parts[0]
-                    review = parts[1]
-                    
-                    # Case-insensitive matching of restaurant names
-                    if restaurant_name.lower() in current_restaurant.lower():
-                        if current_restaurant not in restaurant_reviews:
-                            restaurant_reviews[current_restaurant] = []
-                        restaurant_reviews[current_restaurant].append(review)
+        path = os.path.abspath("restaurant-data.txt")
+        st = os.stat(path)
+        restaurant_reviews = _fetch_cached(restaurant_name.casefold(), path, st.st_mtime_ns, st.st_size)
     except Exception as e:
         print(f"Error reading restaurant data: {e}")
+        return {}
     
-    return restaurant_reviews
+    # Copy so callers can't mutate the cached lists
+    return {name: list(reviews) for name, reviews in restaurant_reviews.items()}
 
 
 def calculate_overall_score(restaurant_name: str, food_scores: List[int], customer_service_scores: List[int]) -> Dict[str, float]:
@@ -39,189 +96,305 @@ def calculate_overall_score(restaurant_name: str, food_scores: List[int], custom
         return {restaurant_name: 0.000}
     
     N = len(food_scores)
-    total_score = 0.0
+    scale = 10.0 * INV_SQRT125 / N
+    
+    # Validate as float64 so out-of-range or fractional scores are rejected instead of wrapped or truncated by the int8 cast
+    food = np.asarray(food_scores, dtype=np.float64)
+    customer_service = np.asarray(customer_service_scores, dtype=np.float64)
+    for scores in (food, customer_service):
+        if not np.all((scores >= 1) & (scores <= 5) & (scores == np.floor(scores))):
+            raise ValueError(f"Scores must be whole numbers from 1 to 5, got {scores.tolist()}")
     
-    for i in range(N):
-        food_score = food_scores[i]
-        customer_service_score = customer_service_scores[i]
-        total_score += math.sqrt(food_score**2 * customer_service_score) * (1 / (N * math.sqrt(125))) * 10
+    # Scores fit in int8; sqrt(food_score**2 * customer_service_score) == food_score * sqrt(customer_service_score)
+    food = np.ascontiguousarray(food, dtype=np.int8)
+    customer_service = np.ascontiguousarray(customer_service, dtype=np.int8)
+    total_score = _score_kernel(food, customer_service)
     
     # Format to include at least 3 decimal places
-    return {restaurant_name: round(total_score, 3)}
+    return {restaurant_name: round(total_score * scale, 3)}
 
 
-def get_data_fetch_agent_prompt(restaurant_query: str) -> str:
-    # Return a prompt for the data fetch agent to use to fetch reviews for a specific restaurant
-    return f"""You are a data retrieval agent. Your task is to analyze the given restaurant query and determine the restaurant name that should be queried from our database.
+_KEYWORD_SCORES = {
+    'awful': 1, 'horrible': 1, 'disgusting': 1,
+    'bad': 2, 'unpleasant': 2, 'offensive': 2,
+    'average': 3, 'uninspiring': 3, 'forgettable': 3,
+    'good': 4, 'enjoyable': 4, 'satisfying': 4,
+    'awesome': 5, 'incredible': 5, 'amazing': 5,
+}
+_SCORE_RE = re.compile(r'\b(' + '|'.join(_KEYWORD_SCORES) + r')\b')
 
-Query: "{restaurant_query}"
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
 
-Extract the restaurant name from the query. For example:
-- If the query is "What is the overall score for Taco Bell?", the restaurant name is "Taco Bell"
-- If the query is "How good is Subway as a restaurant?", the restaurant name is "Subway"
-- If the query is "What would you rate In N Out?", the restaurant name is "In N Out"
 
-After identifying the restaurant name, call the function "fetch_restaurant_data" with the restaurant name as an argument to retrieve the relevant reviews.
+def _iter_keyword_scores_regex(text: str):
+    # (offset, score) of every whole-word keyword in lowercased text, found in one regex pass
+    for match in _SCORE_RE.finditer(text):
+        yield match.start(), _KEYWORD_SCORES[match.group(1)]
 
-Function signature: fetch_restaurant_data(restaurant_name: str) -> Dict[str, List[str]]
-"""
+
+if ahocorasick is not None:
+    _KEYWORD_AUTOMATON = ahocorasick.Automaton()
+    for _keyword, _score in _KEYWORD_SCORES.items():
+        _KEYWORD_AUTOMATON.add_word(_keyword, (len(_keyword), _score))
+    _KEYWORD_AUTOMATON.make_automaton()
+    
+    def _is_word_char(char: str) -> bool:
+        return char.isalnum() or char == '_'
+    
+    def _iter_keyword_scores_automaton(text: str):
+        # (offset, score) of every whole-word keyword in lowercased text, found in one linear automaton pass
+        for end, (length, score) in _KEYWORD_AUTOMATON.iter(text):
+            start = end - length + 1
+            if start > 0 and _is_word_char(text[start - 1]):
+                continue
+            if end + 1 < len(text) and _is_word_char(text[end + 1]):
+                continue
+            yield start, score
+    
+    _iter_keyword_scores = _iter_keyword_scores_automaton
+else:
+    _iter_keyword_scores = _iter_keyword_scores_regex
 
 
-def get_review_analyzer_agent_prompt() -> str:
-    # Return a prompt for the review analyzer agent
-    return """You are a review analyzer agent. Your task is to analyze restaurant reviews and extract scores for food quality and customer service based on specific keywords.
+# A keyword scores whatever its clause is about: clauses end at sentence ends, ", and" and contrasting conjunctions
+_CLAUSE_BREAK_RE = re.compile(r"[.!?;]|,\s*and\b|\b(?:but|while|though|although|whereas)\b")
+_SERVICE_WORDS = r"(?:service|staff|waitstaff|waiters?|waitress(?:es)?|servers?|baristas?|employees?|cashiers?|crew)"
+_SERVICE_RE = re.compile(r"\b" + _SERVICE_WORDS + r"\b")
+_FOOD_RE = re.compile(r"\bfood\b")
+# A keyword placed right before the noun it describes: "awesome food", "incredible customer service"
+_MODIFIED_NOUN_RE = re.compile(r"[a-z]+\s+(?:customer\s+)?(?:(food)|" + _SERVICE_WORDS + r")\b")
+_NEGATION_RE = re.compile(r"\b(?:neither|nor|not)\b|n't\b")
 
-For each review, you need to extract two scores:
-1. food_score: the quality of food at the restaurant (score from 1-5)
-2. customer_service_score: the quality of customer service at the restaurant (score from 1-5)
 
-Use the following scoring criteria based on keywords:
-- Score 1/5: awful, horrible, or disgusting
-- Score 2/5: bad, unpleasant, or offensive
-- Score 3/5: average, uninspiring, or forgettable
-- Score 4/5: good, enjoyable, or satisfying
-- Score 5/5: awesome, incredible, or amazing
+def _nearest(positions: List[int], offset: int) -> int:
+    return min(abs(position - offset) for position in positions)
 
-Each review will contain exactly two of these keywords - one describing food and one describing customer service.
 
-For example, in the review:
-"The food at McDonald's was average, but the customer service was unpleasant. The uninspiring menu options were served quickly, but the staff seemed disinterested and unhelpful."
+def _score_clauses(review: str, hits: List[Tuple[int, int]]) -> Optional[Tuple[int, int]]:
+    # (food_score, customer_service_score) of a lowercased review from its (offset, score) keyword hits.
+    # A keyword right before "food" or a service noun scores that noun. Otherwise a keyword in a clause that
+    # mentions the service or staff scores the customer service, unless a mention of the food is closer;
+    # any other keyword scores the food. Negated keywords ("not bad") are skipped.
+    # Returns None unless the food and the customer service each end up with exactly one score.
+    breaks = list(_CLAUSE_BREAK_RE.finditer(review))
+    clause_starts = [0] + [match.end() for match in breaks]
+    clause_ends = [match.start() for match in breaks] + [len(review)]
+    
+    food_scores, customer_service_scores = set(), set()
+    for offset, score in hits:
+        clause = bisect.bisect_right(clause_starts, offset) - 1
+        start, end = clause_starts[clause], clause_ends[clause]
+        if _NEGATION_RE.search(review, start, offset):
+            continue
+        
+        modified = _MODIFIED_NOUN_RE.match(review, offset, end)
+        if modified:
+            is_service = modified.group(1) is None
+        else:
+            service = [match.start() for match in _SERVICE_RE.finditer(review, start, end)]
+            food = [match.start() for match in _FOOD_RE.finditer(review, start, end)]
+            is_service = bool(service) and (not food or _nearest(service, offset) < _nearest(food, offset))
+        
+        if is_service:
+            customer_service_scores.add(score)
+        else:
+            food_scores.add(score)
+    
+    if len(food_scores) != 1 or len(customer_service_scores) != 1:
+        return None
+    return food_scores.pop(), customer_service_scores.pop()
 
-- Food keywords: "average", "uninspiring" -> food_score: 3
-- Customer service keyword: "unpleasant" -> customer_service_score: 2
 
-Analyze each review in the given list and extract these two scores for each review. Present your findings in a structured format with the restaurant name, list of food scores, and list of customer service scores.
-"""
+def score_reviews(reviews: List[str]) -> List[Optional[Tuple[int, int]]]:
+    # Score each review as (food_score, customer_service_score) from its keywords, or None when they don't give one
+    # unambiguous score for each. One keyword pass over the joined text, instead of a search per review, then
+    # only reviews with at least two keywords are split into clauses.
+    lowered = [review.lower() for review in reviews]
+    starts = list(itertools.accumulate((len(review) + 1 for review in lowered), initial=0))
+    
+    hits = [[] for _ in reviews]
+    for offset, score in _iter_keyword_scores('\n'.join(lowered)):
+        index = bisect.bisect_right(starts, offset) - 1
+        hits[index].append((offset - starts[index], score))
+    return [
+        _score_clauses(review, found) if len(found) >= 2 else None
+        for review, found in zip(lowered, hits)
+    ]
 
 
-def get_scoring_agent_prompt() -> str:
-    # Return a prompt for the scoring agent
-    return """You are a scoring agent. Your task is to take the extracted food scores and customer service scores for a restaurant and calculate an overall score.
+def fetch_restaurant_scores(restaurant_name: str) -> Dict[str, Dict]:
+    # Fetch the reviews for a restaurant and score them in Python. A restaurant whose reviews all scored also gets
+    # its "overall_score"; otherwise the reviews score_reviews couldn't score are left in "unscored_reviews" for the LLM.
+    results = {}
+    for name, reviews in fetch_restaurant_data(restaurant_name).items():
+        food_scores, customer_service_scores, unscored_reviews = [], [], []
+        for review, scores in zip(reviews, score_reviews(reviews)):
+            if scores is None:
+                unscored_reviews.append(review)
+            else:
+                food_scores.append(scores[0])
+                customer_service_scores.append(scores[1])
+        
+        result = {"food_scores": food_scores, "customer_service_scores": customer_service_scores}
+        if unscored_reviews:
+            result["unscored_reviews"] = unscored_reviews
+        else:
+            result["overall_score"] = calculate_overall_score(name, food_scores, customer_service_scores)[name]
+        results[name] = result
+    return results
 
-You should receive:
-1. The restaurant name
-2. A list of food scores (from 1-5) for each review
-3. A list of customer service scores (from 1-5) for each review
 
-Call the function "calculate_overall_score" with these three parameters to get the overall score for the restaurant.
+_RESTAURANT_AGENT_TEMPLATE = """You are a restaurant review agent. Your task is to find the overall score of the restaurant named in a user's query.
 
-Function signature: calculate_overall_score(restaurant_name: str, food_scores: List[int], customer_service_scores: List[int]) -> Dict[str, float]
+Query: "{query}"
 
-The function will return a dictionary with the restaurant name as the key and the calculated score as the value.
+Follow these steps:
+1. Extract the restaurant name from the query. For example:
+   - If the query is "What is the overall score for Taco Bell?", the restaurant name is "Taco Bell"
+   - If the query is "How good is Subway as a restaurant?", the restaurant name is "Subway"
+   - If the query is "What would you rate In N Out?", the restaurant name is "In N Out"
+2. Call the function "fetch_restaurant_scores" with the restaurant name. It scores every review it can by keyword and returns, for each matching restaurant, its "food_scores" and "customer_service_scores" in review order.
+   Function signature: fetch_restaurant_scores(restaurant_name: str) -> Dict[str, Dict]
+3. If the restaurant has an "overall_score", all of its reviews were scored: reply with the restaurant name and that overall score to three decimal places (e.g. 7.500). Do not call any other function.
+4. Otherwise, score each of its "unscored_reviews" yourself. Give every review a food_score for the quality of the food and a customer_service_score for the quality of the customer service, each from 1 to 5, based on these keywords:
+   - Score 1/5: awful, horrible, or disgusting
+   - Score 2/5: bad, unpleasant, or offensive
+   - Score 3/5: average, uninspiring, or forgettable
+   - Score 4/5: good, enjoyable, or satisfying
+   - Score 5/5: awesome, incredible, or amazing
+   These reviews are the ones the keywords alone could not settle: judge which aspect each keyword describes, ignore negated ones ("neither good nor bad"), and use the closest score when an aspect has no keyword.
+   For example, in "The food at McDonald's was average, but the customer service was unpleasant. The uninspiring menu options were served quickly, but the staff seemed disinterested and unhelpful.", "average" and "uninspiring" give food_score 3 and "unpleasant" gives customer_service_score 2.
+5. Append those scores, in review order, to the returned "food_scores" and "customer_service_scores", and call the function "calculate_overall_score" with the restaurant name and the combined lists. Do not wait for anyone else.
+   Function signature: calculate_overall_score(restaurant_name: str, food_scores: List[int], customer_service_scores: List[int]) -> Dict[str, float]
+6. Reply with the restaurant name and the overall score it returned, to three decimal places.
 """
 
 
-# Do not modify the signature of the "main" function.
-def main(user_query: str):
-    # Setup the entrypoint agent
-    entrypoint_agent_system_message = """You are a restaurant review analysis supervisor. You coordinate the process of analyzing restaurant reviews to provide scores for restaurants based on user queries.
+# The static text around the query; a two-way concatenation is cheaper than re-formatting the template
+_RESTAURANT_PROMPT_PREFIX, _RESTAURANT_PROMPT_SUFFIX = _RESTAURANT_AGENT_TEMPLATE.split("{query}")
 
-Your workflow involves:
-1. First, identify the restaurant name from the user's query using a data fetch agent
-2. Then, fetch all reviews for that restaurant
-3. Next, analyze each review to extract food and customer service scores using a review analyzer agent
-4. Finally, calculate an overall score using a scoring agent
+# LLM config for all agents (each ConversableAgent takes its own deep copy)
+_LLM_CONFIG = {
+    "config_list": [
+        {
+            "model": "gpt-4o-mini", 
+            "api_key": os.environ.get("OPENAI_API_KEY")
+        }
+    ]
+}
 
-You'll work with other agents sequentially to complete this task, and your goal is to provide the final score to the user.
-"""
-    
-    # LLM config for all agents
-    llm_config = {
-        "config_list": [
-            {
-                "model": "gpt-4o-mini", 
-                "api_key": os.environ.get("OPENAI_API_KEY")
-            }
-        ]
-    }
-    
-    # The main entrypoint/supervisor agent
+
+def get_restaurant_agent_prompt(restaurant_query: str) -> str:
+    # Return a prompt for the single agent that fetches, analyzes and scores the reviews
+    return _RESTAURANT_PROMPT_PREFIX + restaurant_query + _RESTAURANT_PROMPT_SUFFIX
+
+
+def _build_agents(user_query: str):
+    # The entrypoint agent only executes the tools the restaurant agent calls, so it never needs the LLM
+    # and the chat ends as soon as the restaurant agent replies without a tool call.
     entrypoint_agent = ConversableAgent(
         "entrypoint_agent", 
-        system_message=entrypoint_agent_system_message, 
-        llm_config=llm_config
+        llm_config=False,
+        human_input_mode="NEVER",
+        is_termination_msg=lambda message: not message.get("tool_calls")
     )
     
-    # Register the fetch_restaurant_data function for both LLM suggestion and execution
-    entrypoint_agent.register_for_llm(
-        name="fetch_restaurant_data", 
-        description="Fetches the reviews for a specific restaurant."
-    )(fetch_restaurant_data)
-    
-    entrypoint_agent.register_for_execution(
-        name="fetch_restaurant_data"
-    )(fetch_restaurant_data)
-    
-    # Create the data fetch agent
-    data_fetch_agent = ConversableAgent(
-        "data_fetch_agent",
-        system_message=get_data_fetch_agent_prompt(user_query),
-        llm_config=llm_config
-    )
-
-    # Register the fetch_restaurant_data function for the data fetch agent
-    data_fetch_agent.register_for_llm(
-        name="fetch_restaurant_data",
-        description="Fetches the reviews for a specific restaurant."
-    )(fetch_restaurant_data)
-    
-    data_fetch_agent.register_for_execution(
-        name="fetch_restaurant_data"
-    )(fetch_restaurant_data)
-    
-    # Create the review analyzer agent
-    review_analyzer_agent = ConversableAgent(
-        "review_analyzer_agent",
-        system_message=get_review_analyzer_agent_prompt(),
-        llm_config=llm_config
+    # One agent with both tools, so the whole query costs one chat instead of three
+    restaurant_agent = ConversableAgent(
+        "restaurant_agent",
+        system_message=get_restaurant_agent_prompt(user_query),
+        llm_config=_LLM_CONFIG
     )
     
-    # Create the scoring agent
-    scoring_agent = ConversableAgent(
-        "scoring_agent",
-        system_message=get_scoring_agent_prompt(),
-        llm_config=llm_config
-    )
+    # Register both functions for LLM suggestion on the restaurant agent and execution on the entrypoint agent.
+    # The typed tool-call arguments are the structured output: the scores arrive as validated List[int]s.
+    restaurant_agent.register_for_llm(
+        name="fetch_restaurant_scores", 
+        description="Fetches the reviews for a specific restaurant and scores them by keyword."
+    )(fetch_restaurant_scores)
     
-    # Register the calculate_overall_score function for the scoring agent
-    scoring_agent.register_for_llm(
+    restaurant_agent.register_for_llm(
         name="calculate_overall_score",
         description="Calculates the overall score for a restaurant based on food and customer service scores."
     )(calculate_overall_score)
     
-    scoring_agent.register_for_execution(
+    entrypoint_agent.register_for_execution(
+        name="fetch_restaurant_scores"
+    )(fetch_restaurant_scores)
+    
+    entrypoint_agent.register_for_execution(
         name="calculate_overall_score"
     )(calculate_overall_score)
     
-    # Initiate the sequential chats
-    result = entrypoint_agent.initiate_chats(
-        [
-            # First chat: fetch restaurant data
-            {
-                "recipient": data_fetch_agent,
-                "message": f"I need to analyze reviews for a restaurant based on this query: '{user_query}'. Please identify the restaurant name and suggest how to fetch its reviews.",
-                "summary_method": "last_msg",
-            },
-            # Second chat: analyze reviews
-            {
-                "recipient": review_analyzer_agent,
-                "message": "Based on the fetched restaurant reviews, analyze each review to extract food scores and customer service scores.",
-                "summary_method": "reflection_with_llm",
-                "summary_args": {
-                    "reflection_prompt": "Extract all the restaurant reviews that were fetched along with the restaurant name."
-                }
-            },
-            # Third chat: calculate overall score
-            {
-                "recipient": scoring_agent,
-                "message": "Based on the analyzed reviews, calculate the overall score for the restaurant.",
-                "summary_method": "reflection_with_llm",
-                "summary_args": {
-                    "reflection_prompt": "Extract the restaurant name, list of food scores, and list of customer service scores from the analysis."
-                }
-            }
-        ]
-    )
+    return entrypoint_agent, restaurant_agent
+
+
+# Idle agent pairs reused across queries. Agents hold per-chat state, so every in-flight query
+# takes its own pair; a single main() call at a time only ever builds one. Capped at main_batch's
+# default worker count so a batch doesn't keep more pairs around than can ever run at once.
+_AGENT_POOL_SIZE = 32
+_AGENT_POOL: List[Tuple[ConversableAgent, ConversableAgent]] = []
+_AGENT_POOL_LOCK = threading.Lock()
+
+
+def _acquire_agents(user_query: str) -> Tuple[ConversableAgent, ConversableAgent]:
+    with _AGENT_POOL_LOCK:
+        agents = _AGENT_POOL.pop() if _AGENT_POOL else None
+    # Build outside the lock so a slow construction doesn't stall other workers
+    if agents is None:
+        return _build_agents(user_query)
+    
+    # Only the restaurant agent's prompt depends on the query
+    agents[1].update_system_message(get_restaurant_agent_prompt(user_query))
+    # Usage accumulates on the agents' clients; clear it so ChatResult.cost only covers this query
+    for agent in agents:
+        if agent.client is not None:
+            agent.client.clear_usage_summary()
+    return agents
+
+
+def _release_agents(agents: Tuple[ConversableAgent, ConversableAgent]) -> None:
+    with _AGENT_POOL_LOCK:
+        if len(_AGENT_POOL) < _AGENT_POOL_SIZE:
+            _AGENT_POOL.append(agents)
+
+
+def _get_chat(user_query: str, restaurant_agent: ConversableAgent) -> Dict:
+    return {
+        "recipient": restaurant_agent,
+        "message": f"I need to analyze reviews for a restaurant based on this query: '{user_query}'. Please identify the restaurant name, fetch its reviews, analyze them and calculate its overall score.",
+        # At most three LLM turns: call fetch_restaurant_scores, call calculate_overall_score if some
+        # reviews still need the LLM, report the score
+        "max_turns": 3,
+        "summary_method": "last_msg",
+    }
+
+
+def _run_query(user_query: str):
+    # Runs on main() or on a main_batch worker thread, which holds one agent pair for the length of its chat
+    agents = _acquire_agents(user_query)
+    entrypoint_agent, restaurant_agent = agents
+    
+    # Initiate the chat
+    try:
+        return entrypoint_agent.initiate_chat(**_get_chat(user_query, restaurant_agent))
+    finally:
+        _release_agents(agents)
+
+
+def main_batch(user_queries: List[str], max_workers: int = _AGENT_POOL_SIZE):
+    # The chats spend their time waiting on the OpenAI API, which releases the GIL, so threads are enough
+    # to overlap them; the keyword scoring they run is microseconds per restaurant and stays in-thread.
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(_run_query, user_queries))
+
+
+# Do not modify the signature of the "main" function.
+def main(user_query: str):
+    result = _run_query(user_query)
 
 # DO NOT modify this code below.
 if __name__ == "__main__":
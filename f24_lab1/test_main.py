@@ -0,0 +1,137 @@
+import os
+
+import pytest
+
+import main
+
+
+@pytest.fixture(autouse=True)
+def _lab_dir(monkeypatch):
+    # main reads restaurant-data.txt relative to the working directory
+    monkeypatch.chdir(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_calculate_overall_score():
+    assert main.calculate_overall_score("X", [5, 5], [5, 5]) == {"X": 10.0}
+    assert main.calculate_overall_score("X", [3, 4], [4, 2]) == {"X": 5.213}
+    assert main.calculate_overall_score("X", [], []) == {"X": 0.0}
+
+
+@pytest.mark.parametrize("food, customer_service", [
+    ([6], [5]),
+    ([5], [6]),
+    ([0], [3]),
+    # Must not index the sqrt table from the end
+    ([3], [-1]),
+    ([4, 4], [4, 300]),
+])
+def test_calculate_overall_score_rejects_out_of_range(food, customer_service):
+    with pytest.raises(ValueError):
+        main.calculate_overall_score("X", food, customer_service)
+
+
+@pytest.mark.parametrize("food, customer_service", [
+    # Used to be truncated to ([4], [4]) and score 7.155 instead of 8.05
+    ([4.5], [4]),
+    ([4], [2.9]),
+    ([float("nan")], [4]),
+])
+def test_calculate_overall_score_rejects_non_integers(food, customer_service):
+    with pytest.raises(ValueError):
+        main.calculate_overall_score("X", food, customer_service)
+
+
+def test_calculate_overall_score_accepts_integral_floats():
+    assert main.calculate_overall_score("X", [4.0, 3.0], [5.0, 2.0]) == main.calculate_overall_score("X", [4, 3], [5, 2])
+
+
+def test_fetch_restaurant_data_non_ascii_names(tmp_path, monkeypatch):
+    # Names are decoded before case-folding, so non-ASCII letters still match case-insensitively
+    (tmp_path / "restaurant-data.txt").write_text("CAFÉ Noir. The food was good. The service was average.\n", encoding="utf-8")
+    monkeypatch.chdir(tmp_path)
+    assert main.fetch_restaurant_data("café noir") == {"CAFÉ Noir": ["The food was good. The service was average."]}
+
+
+def _review(restaurant_name, prefix):
+    # The one review of restaurant_name in restaurant-data.txt that starts with prefix
+    matches = [review for review in main.fetch_restaurant_data(restaurant_name)[restaurant_name] if review.startswith(prefix)]
+    assert len(matches) == 1
+    return matches[0]
+
+
+@pytest.mark.parametrize("restaurant_name, prefix, expected", [
+    ("Taco Bell", "The food at Taco Bell was bad, lacking in flavor and freshness", (2, 3)),
+    # More than two keywords: the first two are not (food, customer service)
+    ("Cinnabon", "Cinnabon's cinnamon rolls are incredible, with an amazing aroma", (5, 3)),
+    ("Olive Garden", "Olive Garden offers good Italian-American cuisine", (4, 3)),
+    ("Applebee's", "Applebee's provided an average meal", (3, 4)),
+    ("IHOP", "IHOP serves up average breakfast fare", (3, 3)),
+    ("Buffalo Wild Wings", "The wings at Buffalo Wild Wings were satisfying, with a good range of flavors. The service was forgettable, neither particularly", (4, 3)),
+    # The service keyword comes first
+    ("Cinnabon", "Cinnabon's cinnamon rolls are incredibly indulgent and delicious. The customer service is average, but", (5, 3)),
+    # "X food and Y service": each keyword describes the noun right after it
+    ("Chick-fil-A", "Chick-fil-A never disappoints with their awesome food and incredible customer service.", (5, 5)),
+    ("Panda Express", "Panda Express served up average Chinese-American fare.", (3, 3)),
+    # Conflicting or missing scores are left for the LLM
+    ("McDonald's", "The food at McDonald's was average, but the customer service was unpleasant. The uninspiring meal", None),
+    ("Starbucks", "Both the food and service at Starbucks", None),
+    ("Cinnabon", "Cinnabon's cinnamon rolls are incredibly delicious and always a treat.", None),
+])
+def test_score_reviews(restaurant_name, prefix, expected):
+    assert main.score_reviews([_review(restaurant_name, prefix)]) == [expected]
+
+
+def test_fetch_restaurant_scores():
+    result = main.fetch_restaurant_scores("taco bell")["Taco Bell"]
+    assert result["overall_score"] == 3.253
+    assert "unscored_reviews" not in result
+    
+    assert main.fetch_restaurant_scores("chick-fil-a")["Chick-fil-A"]["overall_score"] == 10.0
+    
+    result = main.fetch_restaurant_scores("cinnabon")["Cinnabon"]
+    assert "overall_score" not in result
+    assert len(result["unscored_reviews"]) == 4
+    assert len(result["food_scores"]) == len(result["customer_service_scores"]) == 36
+
+
+_KEYWORD_BACKENDS = [
+    main._iter_keyword_scores_regex,
+    pytest.param(
+        getattr(main, "_iter_keyword_scores_automaton", None),
+        marks=pytest.mark.skipif(main.ahocorasick is None, reason="ahocorasick is not installed"),
+        id="automaton",
+    ),
+]
+
+
+@pytest.mark.parametrize("iter_keyword_scores", _KEYWORD_BACKENDS)
+def test_iter_keyword_scores(iter_keyword_scores):
+    text = "good food, not-bad service.\nbadly goodness good_ _good awesome!\n(amazing)"
+    assert list(iter_keyword_scores(text)) == [(0, 4), (15, 2), (55, 5), (65, 5)]
+    # Input is already lowercased: no Unicode case folding, so a long s doesn't match "disgusting"
+    assert list(iter_keyword_scores("the food was disgu\u017fting")) == []
+
+
+@pytest.mark.parametrize("iter_keyword_scores", _KEYWORD_BACKENDS)
+def test_iter_keyword_scores_matches_regex(iter_keyword_scores):
+    with open("restaurant-data.txt", encoding="utf-8") as file:
+        text = file.read().lower()
+    assert list(iter_keyword_scores(text)) == list(main._iter_keyword_scores_regex(text))
+
+
+def test_fetch_restaurant_data_cache_key(tmp_path, monkeypatch):
+    # Files in different directories with the same mtime, and an edit that keeps the mtime, must not share a cache entry
+    first, second = tmp_path / "first", tmp_path / "second"
+    for directory, review in ((first, "The food was good."), (second, "The food was bad.")):
+        directory.mkdir()
+        (directory / "restaurant-data.txt").write_text(f"Diner. {review}\n", encoding="utf-8")
+        os.utime(directory / "restaurant-data.txt", ns=(0, 0))
+    
+    monkeypatch.chdir(first)
+    assert main.fetch_restaurant_data("diner") == {"Diner": ["The food was good."]}
+    monkeypatch.chdir(second)
+    assert main.fetch_restaurant_data("diner") == {"Diner": ["The food was bad."]}
+    
+    (second / "restaurant-data.txt").write_text("Diner. The food was average.\n", encoding="utf-8")
+    os.utime(second / "restaurant-data.txt", ns=(0, 0))
+    assert main.fetch_restaurant_data("diner") == {"Diner": ["The food was average."]}